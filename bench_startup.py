@@ -0,0 +1,50 @@
+"""Cold-start benchmark for the lightweight perks.py commands.
+
+Runs each command in a fresh interpreter several times and reports the median
+wall time, next to a bare `python -c pass` for reference. Render runs in a
+scratch directory so the real outputs are left alone.
+
+    python bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PERKS = os.path.join(HERE, 'perks.py')
+
+
+def time_command(args, cwd, runs):
+    """Median wall time of args in milliseconds"""
+    env = dict(os.environ, PYTHONPATH=HERE)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    try:
+        shutil.copy(os.path.join(HERE, 'overwatch_perks.csv'), scratch)
+        commands = [
+            ("python (baseline)", [sys.executable, '-c', 'pass'], HERE),
+            ("import perks", [sys.executable, '-c', 'import perks'], HERE),
+            ("perks.py query --hero Ana", [sys.executable, PERKS, 'query', '--hero', 'Ana'], HERE),
+            ("perks.py render", [sys.executable, PERKS, 'render'], scratch),
+        ]
+        for label, command, cwd in commands:
+            print(f"{label:<28} {time_command(command, cwd, args.runs):7.1f} ms")
+    finally:
+        shutil.rmtree(scratch)
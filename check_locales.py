@@ -0,0 +1,101 @@
+"""Check that rendering a second locale keeps its outputs separate.
+
+Renders the default locale (with the split deck) from the existing CSV in a
+scratch directory, then renders a stub extra locale from the same records and
+checks that:
+  - none of the default locale's outputs (index.html, its search index, deck/)
+    were touched,
+  - the extra locale got its own suffixed outputs and deck directory,
+  - every page of the extra deck is tagged with its language and every deck
+    link points at a page that exists.
+
+    python check_locales.py
+"""
+import contextlib
+import hashlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import perks
+
+STUB_LOCALE = 'xx'
+
+# Rewritten by every render on purpose: they cover all locales at once
+SHARED_OUTPUTS = {'sw.js', 'precache-manifest.json'}
+
+
+def snapshot(directory):
+    """{relative path: sha256} of every file under directory"""
+    hashes = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+            with open(os.path.join(root, name), 'rb') as f:
+                hashes[path] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def check_stub_locale(scratch):
+    """Return a list of problems found rendering STUB_LOCALE next to the default"""
+    records = perks.load_perks_csv(os.path.join(scratch, perks.DATA_FILE))
+    with contextlib.redirect_stdout(io.StringIO()):
+        perks.render_outputs(records, split=True)
+    before = snapshot(scratch)
+
+    perks.LOCALES[STUB_LOCALE] = dict(perks.LOCALES[perks.DEFAULT_LOCALE], lang=STUB_LOCALE)
+    # Localised hero names, as a real second locale would have
+    stub_records = [perk._replace(hero=perk.hero + " (xx)") for perk in records]
+    with contextlib.redirect_stdout(io.StringIO()):
+        perks.render_outputs(stub_records, split=True, locale=STUB_LOCALE)
+    after = snapshot(scratch)
+
+    problems = []
+    for path, content_hash in before.items():
+        if path not in SHARED_OUTPUTS and after.get(path) != content_hash:
+            problems.append(f"default output {path} was overwritten")
+
+    deck_dir = perks.locale_filename(perks.DECK_DIR, STUB_LOCALE)
+    expected = [
+        perks.locale_filename('index.html', STUB_LOCALE),
+        perks.locale_filename('perk_search_index.js', STUB_LOCALE),
+        f"{deck_dir}/index.html",
+        f"{deck_dir}/perks.css",
+        f"{deck_dir}/perks.js",
+    ]
+    problems += [f"missing {path}" for path in expected if path not in after]
+
+    for path in sorted(after):
+        if not (path.startswith(deck_dir + '/') and path.endswith('.html')):
+            continue
+        with open(os.path.join(scratch, path), encoding='utf-8') as f:
+            html = f.read()
+        if f'lang="{STUB_LOCALE}"' not in html:
+            problems.append(f"{path} is not tagged lang=\"{STUB_LOCALE}\"")
+        for href in set(re.findall(r'<a [^>]*href="([^"]+\.html)"', html)):
+            if f"{deck_dir}/{href}" not in after:
+                problems.append(f"{path} links to missing {deck_dir}/{href}")
+    return problems
+
+
+if __name__ == "__main__":
+    scratch = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        shutil.copy(os.path.join(HERE, perks.DATA_FILE), scratch)
+        os.chdir(scratch)
+        problems = check_stub_locale(scratch)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch)
+
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} problem(s) rendering locale '{STUB_LOCALE}' next to '{perks.DEFAULT_LOCALE}'")
+    sys.exit(1 if problems else 0)
@@ -1,13 +1,134 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import re
 import os
+import csv
+import json
+import glob
+import hashlib
+import struct
+import zlib
+from typing import NamedTuple
 from urllib.parse import urlparse, unquote
 
-def scrape_overwatch_perks():
-    # URL of the Overwatch perks wiki page
-    url = "https://overwatch.fandom.com/wiki/Perks"
+# requests, bs4 and pandas are imported inside the stages that need them, so
+# render-only and query-only commands start without paying for them
+
+DATA_FILE = 'overwatch_perks.csv'
+
+class Perk(NamedTuple):
+    """One row of the perks dataset"""
+    role: str
+    hero: str
+    tier: str
+    perk_name: str
+    description: str
+    icon_url: str
+    hero_icon_url: str
+    local_icon_path: str
+    local_hero_icon_path: str
+
+# CSV column for each Perk field, in file order
+CSV_COLUMNS = [
+    'Role',
+    'Hero',
+    'Tier',
+    'Perk Name',
+    'Description',
+    'Icon URL',
+    'Hero Icon URL',
+    'Local Icon Path',
+    'Local Hero Icon Path',
+]
+
+def load_perks_csv(csv_path=DATA_FILE):
+    """Read the perks CSV into Perk records using only the stdlib"""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        return [
+            Perk(*(row.get(column) or "" for column in CSV_COLUMNS))
+            for row in csv.DictReader(f)
+        ]
+
+def perks_from_dataframe(dataframe):
+    """Convert the scraped DataFrame into Perk records"""
+    columns = dataframe.reindex(columns=CSV_COLUMNS).fillna("")
+    return [Perk(*row) for row in columns.itertuples(index=False, name=None)]
+
+# Query parameter -> Perk field it filters on
+INDEXED_FIELDS = {
+    'role': 'role',
+    'hero': 'hero',
+    'tier': 'tier',
+    'name': 'perk_name',
+}
+
+def _index_keys(field, value):
+    """Lookup keys a value is indexed under (case-insensitive)"""
+    key = value.strip().lower()
+    keys = [key]
+    # Let "major"/"minor" match "Major Perk"/"Minor Perk"
+    if field == 'tier' and key.endswith(' perk'):
+        keys.append(key[:-len(' perk')])
+    return keys
+
+def build_indexes(perks):
+    """Build {param: {lowercased value: [row ids]}} for every indexed field"""
+    indexes = {param: {} for param in INDEXED_FIELDS}
+    for row_id, perk in enumerate(perks):
+        for param, field in INDEXED_FIELDS.items():
+            for key in _index_keys(field, getattr(perk, field)):
+                indexes[param].setdefault(key, []).append(row_id)
+    return indexes
+
+def query_indexes(perks, indexes, params):
+    """Return the perks matching params ({param: [values]}).
+
+    Repeated values for one parameter are OR-ed together, different
+    parameters are AND-ed.
+    """
+    matches = None
+    for param, values in params.items():
+        index = indexes[param]
+        ids = set()
+        for value in values:
+            ids.update(index.get(value.strip().lower(), ()))
+        matches = ids if matches is None else matches & ids
+        if not matches:
+            return []
+    if matches is None:
+        return list(perks)
+    return [perks[row_id] for row_id in sorted(matches)]
+
+# Wiki page to scrape per locale, and the section ID of each role's table on it.
+# Role keys stay in English so the page filters behave the same in every locale.
+# An optional 'tiers' mapping translates the page's tier labels back to the
+# English ones the filters expect.
+LOCALES = {
+    'en': {
+        'url': "https://overwatch.fandom.com/wiki/Perks",
+        'lang': 'en',
+        'sections': {'Tanks': 'Tanks', 'Damage': 'Damage', 'Support': 'Support'},
+    },
+}
+
+DEFAULT_LOCALE = 'en'
+
+def locale_filename(filename, locale):
+    """Output name for a locale: overwatch_perks.csv -> overwatch_perks.fr.csv.
+
+    The default locale keeps the plain names.
+    """
+    if locale == DEFAULT_LOCALE:
+        return filename
+    base, ext = os.path.splitext(filename)
+    return f"{base}.{locale}{ext}"
+
+def scrape_overwatch_perks(locale=DEFAULT_LOCALE):
+    import requests
+    from bs4 import BeautifulSoup
+    import pandas as pd
+    
+    # URL of the Overwatch perks wiki page for this locale
+    config = LOCALES[locale]
+    url = config['url']
     
     # Send a GET request to the URL
     response = requests.get(url)
@@ -23,15 +144,16 @@ def scrape_overwatch_perks():
     # Initialize a list to store all perk data
     all_perks = []
     
-    # Process each role section (Tanks, Damage, Support)
-    role_sections = ['Tanks', 'Damage', 'Support']
+    # Process each role section (Tanks, Damage, Support) by its localised section ID
+    role_sections = config['sections']
+    tier_names = {label: tier for tier, label in config.get('tiers', {}).items()}
     
     # Dictionary to store hero icons
     hero_icons = {}
     
-    for role in role_sections:
+    for role, section_id in role_sections.items():
         # Find the section header for this role
-        role_header = soup.find('span', {'id': role})
+        role_header = soup.find('span', {'id': section_id})
         
         if not role_header:
             print(f"Could not find section for {role}")
@@ -127,6 +249,7 @@ def scrape_overwatch_perks():
                 
                 # Extract perk tier (Major/Minor)
                 perk_tier = cells[type_idx].get_text().strip()
+                perk_tier = tier_names.get(perk_tier, perk_tier)
                 
                 # Extract perk description
                 perk_description = cells[desc_idx].get_text().strip()
@@ -170,8 +293,27 @@ def scrape_overwatch_perks():
     
     return perks_df
 
-def download_images(dataframe):
-    """Download all perk icons and hero icons to local directories"""
+def scrape_locales(locales):
+    """Scrape several locales in parallel; returns {locale: DataFrame or None}"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # The time goes into fetching the pages, so threads overlap the waiting
+    with ThreadPoolExecutor(max_workers=len(locales)) as executor:
+        results = executor.map(scrape_overwatch_perks, locales)
+        return dict(zip(locales, results))
+
+def icon_cache_key(url):
+    """Identify an image by its URL without the cache-busting query string"""
+    return urlparse(url)._replace(query='').geturl()
+
+def download_images(dataframe, downloaded=None):
+    """Download all perk icons and hero icons to local directories.
+
+    downloaded maps icon_cache_key(url) -> local path. Passing the same dict for
+    every locale means an image shared between locales is fetched only once.
+    """
+    if downloaded is None:
+        downloaded = {}
     
     # Create directories if they don't exist
     os.makedirs('perk_icons', exist_ok=True)
@@ -193,6 +335,9 @@ def download_images(dataframe):
         icon_url = row['Icon URL']
         if not icon_url:
             local_perk_paths.append("")
+        elif icon_cache_key(icon_url) in downloaded:
+            # Same image already handled for this or another locale
+            local_perk_paths.append(downloaded[icon_cache_key(icon_url)])
         else:
             try:
                 # Create a unique filename using hero name and perk name
@@ -211,18 +356,15 @@ def download_images(dataframe):
                 if filename in existing_perk_icons:
                     print(f"Perk icon already exists: {filename}")
                     local_perk_paths.append(local_path)
+                    downloaded[icon_cache_key(icon_url)] = local_path
                 else:
                     # Download the image
                     print(f"Downloading perk icon: {icon_url} as {filename}")
-                    img_response = requests.get(icon_url, stream=True)
                     
-                    if img_response.status_code == 200:
-                        with open(local_path, 'wb') as f:
-                            for chunk in img_response.iter_content(1024):
-                                f.write(chunk)
-                                
+                    if download_file(icon_url, local_path):
                         local_perk_paths.append(local_path)
                         existing_perk_icons.add(filename)  # Add to our tracking set
+                        downloaded[icon_cache_key(icon_url)] = local_path
                         print(f"Downloaded to {local_path}")
                     else:
                         print(f"Failed to download {icon_url}")
@@ -235,7 +377,10 @@ def download_images(dataframe):
         hero_name = row['Hero']
         hero_icon_url = row['Hero Icon URL']
         
-        if hero_name not in processed_heroes and hero_icon_url:
+        if hero_icon_url and icon_cache_key(hero_icon_url) in downloaded:
+            # Same image already handled for this or another locale
+            processed_heroes.add(hero_name)
+        elif hero_name not in processed_heroes and hero_icon_url:
             try:
                 # Create a filename for the hero icon
                 hero_filename = f"{hero_name.replace(' ', '_').replace('.', '')}.png"
@@ -246,18 +391,15 @@ def download_images(dataframe):
                 # Check if file already exists
                 if hero_filename in existing_hero_icons:
                     print(f"Hero icon already exists: {hero_filename}")
+                    downloaded[icon_cache_key(hero_icon_url)] = local_hero_path
                 else:
                     # Download the hero icon
                     print(f"Downloading hero icon: {hero_icon_url} as {hero_filename}")
-                    hero_img_response = requests.get(hero_icon_url, stream=True)
                     
-                    if hero_img_response.status_code == 200:
-                        with open(local_hero_path, 'wb') as f:
-                            for chunk in hero_img_response.iter_content(1024):
-                                f.write(chunk)
-                        
+                    if download_file(hero_icon_url, local_hero_path):
                         print(f"Downloaded hero icon to {local_hero_path}")
                         existing_hero_icons.add(hero_filename)  # Add to our tracking set
+                        downloaded[icon_cache_key(hero_icon_url)] = local_hero_path
                     else:
                         print(f"Failed to download hero icon {hero_icon_url}")
                 
@@ -267,7 +409,9 @@ def download_images(dataframe):
                 print(f"Error downloading hero icon {hero_icon_url}: {e}")
         
         # Record the path for this row (even if we've seen this hero before)
-        if hero_name:
+        if hero_icon_url and icon_cache_key(hero_icon_url) in downloaded:
+            local_hero_paths.append(downloaded[icon_cache_key(hero_icon_url)])
+        elif hero_name:
             hero_filename = f"{hero_name.replace(' ', '_').replace('.', '')}.png"
             hero_filename = re.sub(r'[^\w\.-]', '_', hero_filename)
             local_hero_paths.append(os.path.join('hero_icons', hero_filename))
@@ -279,28 +423,224 @@ def download_images(dataframe):
     dataframe['Local Hero Icon Path'] = local_hero_paths
     return dataframe
 
-def save_to_formats(dataframe):
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def check_png(path):
+    """Fully decode a PNG's structure; return None if it is valid, else the problem.
+
+    Checks the signature, every chunk's length and CRC, and that the image data
+    inflates to the end of its zlib stream, which catches truncated downloads
+    and HTML error pages saved under a .png name.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    if not data.startswith(PNG_SIGNATURE):
+        return "not a PNG (bad signature)"
+    
+    inflater = zlib.decompressobj()
+    pos = len(PNG_SIGNATURE)
+    first_chunk = True
+    while True:
+        if pos + 8 > len(data):
+            return "truncated (no IEND chunk)"
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        end = pos + 12 + length
+        if end > len(data):
+            return f"truncated inside {chunk_type.decode('latin-1')} chunk"
+        
+        chunk = data[pos + 8:pos + 8 + length]
+        if zlib.crc32(chunk_type + chunk) != struct.unpack('>I', data[end - 4:end])[0]:
+            return f"bad CRC in {chunk_type.decode('latin-1')} chunk"
+        if first_chunk and chunk_type != b'IHDR':
+            return "first chunk is not IHDR"
+        first_chunk = False
+        
+        if chunk_type == b'IDAT':
+            try:
+                inflater.decompress(chunk)
+            except zlib.error as e:
+                return f"corrupt image data: {e}"
+        elif chunk_type == b'IEND':
+            break
+        pos = end
+    
+    if not inflater.eof:
+        return "incomplete image data"
+    return None
+
+def download_file(url, path):
+    """Download url to path; return True if a valid PNG was saved.
+
+    The download goes to a temp file next to path and is only renamed over it
+    once complete and verified, so an interrupted run never leaves a partial file.
+    """
+    import requests
+    import tempfile
+    
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            response = requests.get(url, stream=True, timeout=30)
+            if response.status_code != 200:
+                print(f"Failed to download {url}: status {response.status_code}")
+                return False
+            for chunk in response.iter_content(8192):
+                f.write(chunk)
+        
+        problem = check_png(tmp_path)
+        if problem:
+            print(f"Downloaded {url} is not a valid icon: {problem}")
+            return False
+        
+        os.replace(tmp_path, path)
+        return True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+ICON_DIRS = ['perk_icons', 'hero_icons']
+
+# Size, mtime and source URL of every icon as of its last successful check
+ICON_MANIFEST = 'icon_manifest.json'
+
+MAX_REPORTED_ICONS = 10
+
+def verify_icon_cache(perks=(), full=False, fix=True):
+    """Check every icon in ICON_DIRS and, with fix, re-fetch the broken ones.
+
+    Icons whose size and mtime still match ICON_MANIFEST are trusted without
+    reading them (unless full); anything new or changed gets a full check_png.
+    With fix, broken or missing icons are downloaded again from the URL in the
+    Perk records or the manifest; without it they are only reported, so the
+    check never touches the network. Returns the number of icons still broken.
+    """
+    try:
+        with open(ICON_MANIFEST, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    
+    # Source URL for each local path we know about
+    urls = {}
+    for perk in perks:
+        for local_path, url in ((perk.local_icon_path, perk.icon_url),
+                                (perk.local_hero_icon_path, perk.hero_icon_url)):
+            if local_path and url:
+                urls[local_path.replace('\\', '/')] = url
+    
+    paths = set(urls)
+    for directory in ICON_DIRS:
+        if os.path.isdir(directory):
+            paths.update(f"{directory}/{name}" for name in os.listdir(directory) if name.endswith('.png'))
+    
+    def check(path, url, st):
+        """Full check (and, with fix, re-fetch) of one icon the stat didn't clear"""
+        problem = "missing" if st is None else check_png(path)
+        if problem and url and fix:
+            print(f"Re-fetching {path} ({problem})")
+            try:
+                if download_file(url, path):
+                    st = os.stat(path)
+                    problem = None
+            except Exception as e:
+                print(f"Error re-fetching {path}: {e}")
+        if problem:
+            return path, None, problem
+        return path, {'url': url, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}, None
+    
+    new_manifest = {}
+    broken = []
+    pending = []
+    for path in sorted(paths):
+        entry = manifest.get(path, {})
+        url = urls.get(path) or entry.get('url')
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        
+        # Fast path: unchanged since it last passed a full check
+        if (st and not full and entry.get('size') == st.st_size
+                and entry.get('mtime_ns') == st.st_mtime_ns):
+            new_manifest[path] = dict(entry, url=url)
+        elif st is None and not (url and fix):
+            broken.append((path, "missing"))
+        else:
+            pending.append((path, url, st))
+    
+    # Only start threads when there is decoding or downloading to do
+    if pending:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for path, entry, problem in executor.map(lambda args: check(*args), pending):
+                if entry:
+                    new_manifest[path] = entry
+                if problem:
+                    broken.append((path, problem))
+    broken.sort()
+    fully_checked = len(pending)
+    
+    # Written via a temp file so an interrupted run can't corrupt the manifest
+    with open(ICON_MANIFEST + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, indent=1, sort_keys=True)
+    os.replace(ICON_MANIFEST + '.tmp', ICON_MANIFEST)
+    
+    # A directory without icons would otherwise print one line per icon
+    for path, problem in broken[:MAX_REPORTED_ICONS]:
+        print(f"Broken icon {path}: {problem}")
+    if len(broken) > MAX_REPORTED_ICONS:
+        print(f"... and {len(broken) - MAX_REPORTED_ICONS} more broken icons")
+    if broken and not fix:
+        print("Run 'python perks.py verify' to re-fetch them")
+    print(f"Verified {len(paths)} icons ({fully_checked} fully checked, {len(broken)} broken)")
+    return len(broken)
+
+def tokenize(text):
+    """Split text into lowercase word tokens for the search index"""
+    return re.findall(r'\w+', str(text).lower())
+
+def build_search_index(perks):
+    """Build an inverted index over perk names and descriptions.
+
+    Tokens are sorted so the page can binary-search a prefix range, and each
+    posting list holds the row numbers (= card data-index) containing that token.
+    """
+    postings = {}
+    for i, perk in enumerate(perks):
+        for token in set(tokenize(perk.perk_name) + tokenize(perk.description)):
+            postings.setdefault(token, []).append(i)
+    
+    tokens = sorted(postings)
+    return {
+        'tokens': tokens,
+        'postings': [postings[token] for token in tokens],
+    }
+
+def save_to_formats(dataframe, split=False, locale=DEFAULT_LOCALE, compositor=False):
     # Save to CSV
-    dataframe.to_csv('overwatch_perks.csv', index=False)
-    print("Data saved to overwatch_perks.csv")
+    csv_file = locale_filename(DATA_FILE, locale)
+    dataframe.to_csv(csv_file, index=False)
+    print(f"Data saved to {csv_file}")
     
     # Save to Excel
-    dataframe.to_excel('overwatch_perks.xlsx', index=False)
-    print("Data saved to overwatch_perks.xlsx")
+    excel_file = locale_filename('overwatch_perks.xlsx', locale)
+    dataframe.to_excel(excel_file, index=False)
+    print(f"Data saved to {excel_file}")
     
-    # Save to HTML with flashcard functionality
-    html_output = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Overwatch 2 Perks</title>
-        <link rel="preconnect" href="https://fonts.googleapis.com">
-        <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-        <link href="https://fonts.googleapis.com/css2?family=Exo+2:ital,wght@0,100..900;1,100..900&display=swap" rel="stylesheet">
-        <style>
+    render_outputs(perks_from_dataframe(dataframe), split, locale, compositor)
+
+def hero_slug(hero):
+    """File-name-safe version of a hero name, as used for hero icons and pages"""
+    return hero.replace(' ', '_').replace('.', '').replace(':', '_')
+
+def page_css(asset_prefix=''):
+    """CSS shared by every flashcard page; asset_prefix points at the top-level assets"""
+    return """
             @font-face {
                 font-family: 'Overwatch' ;
-                src: url('Overwatch_Oblique.ttf') format('truetype');
+                src: url('__ASSET_PREFIX__Overwatch_Oblique.ttf') format('truetype');
             }
             * {
                 -ms-overflow-style: none;  /* IE and Edge */
@@ -448,87 +788,211 @@ def save_to_formats(dataframe):
                 border-radius: 5px;
                 border: none;
             }
+            .search {
+                margin: 5px 0;
+                text-align: center;
+            }
+            .search input {
+                font-family: "Exo 2", sans-serif;
+                font-size: 1em;
+                width: 320px;
+                max-width: 80%;
+                padding: 8px 12px;
+                border-radius: 5px;
+                border: 2px solid #4D4D4D;
+                background-color: #27292f;
+                color: white;
+            }
+            .search input:focus {
+                outline: none;
+                border-color: #f06414;
+            }
             .stats {
                 text-align: center;
                 margin: 20px 0;
                 font-size: 0.7em;
                 color: #777;
             }
+            .deck-nav {
+                text-align: center;
+                margin: 10px 0;
+            }
+            .deck-nav a, .deck-role h2 a {
+                font-family: 'Overwatch';
+                color: #f06414;
+                text-decoration: none;
+                margin: 0 8px;
+            }
+            .deck-role {
+                text-align: center;
+                margin: 30px 0;
+            }
+            .deck-role h2 {
+                font-weight: 400;
+                font-size: 2em;
+            }
+            .deck-heroes {
+                display: flex;
+                flex-wrap: wrap;
+                justify-content: center;
+                gap: 15px;
+            }
+            .deck-hero {
+                display: flex;
+                flex-direction: column;
+                align-items: center;
+                width: 90px;
+                color: white;
+                text-decoration: none;
+            }
+            .deck-hero img {
+                width: 64px;
+                height: 64px;
+                border-radius: 50%;
+                border: 2px solid #4D4D4D;
+                object-fit: cover;
+            }
+            .deck-hero:hover img, .deck-hero:focus img {
+                border-color: #f06414;
+            }
+            /* Compositor mode: flips and hovers only animate transform/opacity,
+               and each card is contained so a flip never invalidates the grid.
+               No paint containment (or content-visibility, which implies it):
+               the near edge of a turning card overhangs its box and would be clipped */
+            body.compositor .flashcard {
+                contain: size layout style;
+            }
+            body.compositor .flashcard-inner {
+                box-shadow: none;
+            }
+            body.compositor .flashcard:hover .flashcard-inner,
+            body.compositor .flashcard.flipping .flashcard-inner {
+                will-change: transform;
+            }
+            body.compositor .flashcard-front {
+                isolation: isolate;
+            }
+            body.compositor .flashcard-front:hover {
+                background-color: #27292f;
+            }
+            body.compositor .flashcard-front::after {
+                content: '';
+                position: absolute;
+                inset: 0;
+                z-index: -1;
+                border-radius: inherit;
+                background-color: #353841;
+                opacity: 0;
+                transition: opacity 0.15s;
+            }
+            body.compositor .flashcard-front:hover::after {
+                opacity: 1;
+            }
+            .perf-overlay {
+                position: fixed;
+                right: 10px;
+                bottom: 10px;
+                z-index: 1000;
+                padding: 8px 12px;
+                border-radius: 5px;
+                background-color: rgba(0, 0, 0, 0.8);
+                color: #76ABFF;
+                font: 12px monospace;
+                white-space: pre;
+                pointer-events: none;
+            }
+            .perf-overlay.over-budget {
+                color: #f06414;
+            }
             @media (max-width: 768px) {
                 .filters {
                     flex-direction: column;
                     align-items: center;
                 }
-                select {
+                select, .search input {
                     width: 80%;
                 }
             }
-        </style>
-    </head>
-    <body>
-        <h1>Overwatch 2 Perks</h1>
-        
-        <div class="controls">
-            <button id="flip-all">Flip All Cards</button>
-            <button id="reset">Reset Cards</button>
-            <button id="shuffle">Shuffle Cards</button>
-        </div>
-        
-        <div class="filters">
-            <select id="role-filter">
-                <option value="all">All Roles</option>
-                <option value="Tanks">Tanks</option>
-                <option value="Damage">Damage</option>
-                <option value="Support">Support</option>
-            </select>
+    """.replace('__ASSET_PREFIX__', asset_prefix)
+
+def page_js():
+    """JavaScript shared by every flashcard page"""
+    return """
+            // Icons, the font and the search index live next to the top-level index.html
+            const assetPrefix = document.body.dataset.assetPrefix || '';
             
-            <select id="hero-filter">
-                <option value="all">All Heroes</option>
-            </select>
+            // Performance overlay, shown with ?perf in the URL: time from each flip or
+            // filter input to the end of the frame that shows its result
+            const perfOverlay = (function() {
+                if (!/[?&]perf\\b/.test(location.search)) return null;
+                
+                const FRAME_BUDGET_MS = 16;
+                const samples = { flip: [], filter: [] };
+                let lastInputTime = null;
+                
+                const overlay = document.createElement('div');
+                overlay.className = 'perf-overlay';
+                document.body.appendChild(overlay);
+                
+                // Remember when the triggering input happened, before any handler runs
+                ['click', 'input'].forEach(type => {
+                    document.addEventListener(type, event => { lastInputTime = event.timeStamp; }, true);
+                });
+                
+                function percentile(values, p) {
+                    const sorted = values.slice().sort((a, b) => a - b);
+                    return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+                }
+                
+                function update() {
+                    let overBudget = false;
+                    overlay.textContent = Object.entries(samples).map(([kind, values]) => {
+                        if (values.length === 0) return `${kind.padEnd(6)} no samples`;
+                        const p95 = percentile(values, 0.95);
+                        const slow = values.filter(v => v > FRAME_BUDGET_MS).length;
+                        overBudget = overBudget || p95 > FRAME_BUDGET_MS;
+                        return `${kind.padEnd(6)} last ${values[values.length - 1].toFixed(1)}ms  ` +
+                               `p95 ${p95.toFixed(1)}ms  ${slow}/${values.length} over ${FRAME_BUDGET_MS}ms`;
+                    }).join('\\n');
+                    overlay.classList.toggle('over-budget', overBudget);
+                }
+                update();
+                
+                return {
+                    // Call at the end of a handler; the sample closes after the next frame paints.
+                    // Updates not started by user input (like the initial render) are skipped.
+                    measure(kind) {
+                        if (lastInputTime === null) return;
+                        const start = lastInputTime;
+                        lastInputTime = null;
+                        requestAnimationFrame(() => setTimeout(() => {
+                            samples[kind].push(performance.now() - start);
+                            if (samples[kind].length > 200) samples[kind].shift();
+                            update();
+                        }, 0));
+                    }
+                };
+            })();
+            
+            // Prefetch a linked deck page as soon as the user hovers over or selects it
+            const prefetched = new Set();
+            function prefetchLink(event) {
+                const link = event.target.closest && event.target.closest('a[data-prefetch]');
+                if (!link || prefetched.has(link.href)) return;
+                prefetched.add(link.href);
+                const hint = document.createElement('link');
+                hint.rel = 'prefetch';
+                hint.href = link.href;
+                document.head.appendChild(hint);
+            }
+            ['mouseover', 'focusin', 'touchstart'].forEach(type => {
+                document.addEventListener(type, prefetchLink, { passive: true });
+            });
             
-            <select id="tier-filter">
-                <option value="all">All Tiers</option>
-                <option value="Major Perk">Major Perks</option>
-                <option value="Minor Perk">Minor Perks</option>
-            </select>
-        </div>
-        
-        <div class="stats" id="stats"></div>
-        
-        <div class="flashcard-container" id="flashcards">
-    """
-    
-    # Generate flashcard HTML for each perk
-    for i, (_, row) in enumerate(dataframe.iterrows()):
-        hero_icon_path = f"hero_icons/{row['Hero'].replace(' ', '_').replace('.', '').replace(':', '_')}.png"
-        tier_class = "major" if "Major" in row['Tier'] else "minor"
-        
-        # Use local path if available, otherwise use URL
-        icon_path = row['Local Icon Path'] if row['Local Icon Path'] else row['Icon URL']
-        
-        html_output += f"""
-        <div class="flashcard" data-role="{row['Role']}" data-hero="{row['Hero']}" data-tier="{row['Tier']}">
-            <div class="flashcard-inner">
-                <div class="flashcard-front">
-                    <img src="{icon_path}" alt="{row['Perk Name']} icon" class="perk-icon" onerror="this.src='https://static.wikia.nocookie.net/overwatch_gamepedia/images/b/bd/Icon-Overwatch_2.png/revision/latest/scale-to-width-down/50';">
-                </div>
-                <div class="flashcard-back">
-
-                    <img src="{hero_icon_path}" class="hero-icon" alt="Hero Icon">
-                    <div class="perk-name">{row['Perk Name']}</div>
-                    <div class="perk-tier {tier_class}">{row['Tier']}</div>
-                    <p class="perk-description">{row['Description']}</p>
-                </div>
-            </div>
-        </div>
-        """
-    
-    # Add JavaScript for interactivity
-    html_output += """
-        </div>
-        
-        <script>
             document.addEventListener('DOMContentLoaded', function() {
+                // Pages without cards (the deck index) only need the prefetching above
+                if (!document.getElementById('flashcards')) return;
+                
                 // Get all card elements
                 const cards = document.querySelectorAll('.flashcard');
                 
@@ -548,8 +1012,24 @@ def save_to_formats(dataframe):
                 // Card flip function
                 function flipCard() {
                     this.classList.toggle('flipped');
+                    
+                    // In compositor mode, keep the card on its own layer only while it turns
+                    if (document.body.classList.contains('compositor')) {
+                        this.classList.add('flipping');
+                    }
+                    if (perfOverlay) perfOverlay.measure('flip');
                 }
                 
+                // A card hidden mid-flip by the filters gets transitioncancel instead of transitionend
+                function endFlip(event) {
+                    if (event.propertyName !== 'transform') return;
+                    const card = event.target.closest('.flashcard');
+                    if (card) card.classList.remove('flipping');
+                }
+                ['transitionend', 'transitioncancel'].forEach(type => {
+                    document.getElementById('flashcards').addEventListener(type, endFlip);
+                });
+                
                 // Initial attachment of click handlers
                 attachCardClickHandlers();
                 
@@ -577,8 +1057,7 @@ def save_to_formats(dataframe):
                         const role = card.dataset.role;
                         
                         if (!processedHeroes.has(hero) && role in heroesByRole) {
-                            const heroIconPath = `hero_icons/${hero.replace(' ', '_').replace('.', '').replace(':', '_')}.png`;
-                            heroesByRole[role].push({ name: hero, iconPath: heroIconPath });
+                            heroesByRole[role].push({ name: hero, iconPath: card.dataset.heroIcon });
                             processedHeroes.add(hero);
                         }
                     });
@@ -734,6 +1213,49 @@ def save_to_formats(dataframe):
                     frontSide.appendChild(heroNameElement);
                 });
                 
+                // Full-text search over the prebuilt inverted index (perk_search_index.js)
+                const searchIndex = window.PERK_SEARCH_INDEX;
+                const searchInput = document.getElementById('search');
+                let searchMatches = null;  // null means no active search
+                
+                // First position in the sorted token list that is >= prefix
+                function lowerBound(tokens, prefix) {
+                    let lo = 0, hi = tokens.length;
+                    while (lo < hi) {
+                        const mid = (lo + hi) >> 1;
+                        if (tokens[mid] < prefix) lo = mid + 1; else hi = mid;
+                    }
+                    return lo;
+                }
+                
+                // Card indices matching every query term (each term as a prefix)
+                function searchPerks(query) {
+                    const terms = query.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu);
+                    if (!terms) return null;
+                    
+                    let result = null;
+                    for (const term of terms) {
+                        const ids = new Set();
+                        for (let i = lowerBound(searchIndex.tokens, term);
+                             i < searchIndex.tokens.length && searchIndex.tokens[i].startsWith(term); i++) {
+                            searchIndex.postings[i].forEach(id => ids.add(id));
+                        }
+                        result = result === null ? ids : new Set([...result].filter(id => ids.has(id)));
+                        if (result.size === 0) break;
+                    }
+                    return result;
+                }
+                
+                if (searchIndex) {
+                    searchInput.addEventListener('input', function() {
+                        searchMatches = searchPerks(this.value);
+                        applyFilters();
+                    });
+                } else {
+                    // No index shipped alongside the page
+                    searchInput.parentNode.style.display = 'none';
+                }
+                
                 // Updated applyFilters function for toggle buttons
                 function applyFilters() {
                     // Get active filters
@@ -756,8 +1278,9 @@ def save_to_formats(dataframe):
                         const matchesRole = activeRoles.length === 0 || activeRoles.includes(cardRole);
                         const matchesHero = activeHeroes.length === 0 || activeHeroes.includes(cardHero);
                         const matchesTier = activeTiers.length === 0 || activeTiers.includes(cardTier);
+                        const matchesSearch = searchMatches === null || searchMatches.has(Number(card.dataset.index));
                         
-                        if (matchesRole && matchesHero && matchesTier) {
+                        if (matchesRole && matchesHero && matchesTier && matchesSearch) {
                             card.style.display = 'block';
                             visibleCount++;
                         } else {
@@ -767,6 +1290,8 @@ def save_to_formats(dataframe):
                     
                     // Update stats
                     document.getElementById('stats').textContent = `SHOWING ${visibleCount} OF ${cards.length} PERKS`;
+                    
+                    if (perfOverlay) perfOverlay.measure('filter');
                 }
                 
                 // Reset all cards button - now also resets filters
@@ -785,6 +1310,10 @@ def save_to_formats(dataframe):
                         button.style.opacity = '0.6';
                     });
                     
+                    // Clear the search box
+                    searchInput.value = '';
+                    searchMatches = null;
+                    
                     // Reset hero icon filters
                     document.querySelectorAll('.hero-filter-icon.active').forEach(icon => {
                         icon.classList.remove('active');
@@ -825,26 +1354,417 @@ def save_to_formats(dataframe):
                 // Initial filter application
                 applyFilters();
             });
-        </script>
+            
+            // Serve repeat visits (and offline study sessions) from the precache
+            if ('serviceWorker' in navigator && location.protocol !== 'file:') {
+                window.addEventListener('load', function() {
+                    navigator.serviceWorker.register(assetPrefix + 'sw.js');
+                });
+            }
+    """
+
+def hero_icon_src(perk, asset_prefix=''):
+    """Image URL of a perk's hero icon"""
+    # Localised hero names don't match the icon file names, so prefer the recorded path
+    if perk.local_hero_icon_path:
+        return asset_prefix + perk.local_hero_icon_path.replace('\\', '/')
+    return f"{asset_prefix}hero_icons/{hero_slug(perk.hero)}.png"
+
+def render_cards(indexed_perks, asset_prefix=''):
+    """Flashcard markup for (search index row, Perk) pairs"""
+    cards_html = ""
+    for i, perk in indexed_perks:
+        hero_icon_path = hero_icon_src(perk, asset_prefix)
+        tier_class = "major" if "Major" in perk.tier else "minor"
+        
+        # Use local path if available, otherwise use URL
+        icon_path = asset_prefix + perk.local_icon_path if perk.local_icon_path else perk.icon_url
+        
+        cards_html += f"""
+        <div class="flashcard" data-index="{i}" data-role="{perk.role}" data-hero="{perk.hero}" data-hero-icon="{hero_icon_path}" data-tier="{perk.tier}">
+            <div class="flashcard-inner">
+                <div class="flashcard-front">
+                    <img src="{icon_path}" alt="{perk.perk_name} icon" class="perk-icon" onerror="this.src='https://static.wikia.nocookie.net/overwatch_gamepedia/images/b/bd/Icon-Overwatch_2.png/revision/latest/scale-to-width-down/50';">
+                </div>
+                <div class="flashcard-back">
+
+                    <img src="{hero_icon_path}" class="hero-icon" alt="Hero Icon">
+                    <div class="perk-name">{perk.perk_name}</div>
+                    <div class="perk-tier {tier_class}">{perk.tier}</div>
+                    <p class="perk-description">{perk.description}</p>
+                </div>
+            </div>
+        </div>
+        """
+    return cards_html
+
+def render_page(body_html, title="Overwatch 2 Perks", asset_prefix='', inline_assets=True,
+                locale=DEFAULT_LOCALE, compositor=False):
+    """Wrap body_html in the page shell.
+
+    With inline_assets the CSS and JS are embedded; otherwise the page links
+    perks.css and perks.js from its own directory so they are cached once.
+    compositor switches on the compositor-only card rendering (body.compositor).
+    """
+    search_index = locale_filename('perk_search_index.js', locale)
+    if inline_assets:
+        styles = "<style>" + page_css(asset_prefix) + "</style>"
+        script = "<script>" + page_js() + "</script>"
+    else:
+        styles = '<link rel="stylesheet" href="perks.css">'
+        script = '<script src="perks.js"></script>'
+    
+    return f"""
+    <!DOCTYPE html>
+    <html lang="{LOCALES[locale].get('lang', locale)}">
+    <head>
+        <title>{title}</title>
+        <link rel="preconnect" href="https://fonts.googleapis.com">
+        <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+        <link href="https://fonts.googleapis.com/css2?family=Exo+2:ital,wght@0,100..900;1,100..900&display=swap" rel="stylesheet">
+        {styles}
+    </head>
+    <body{' class="compositor"' if compositor else ''} data-asset-prefix="{asset_prefix}">
+{body_html}
+        <script src="{asset_prefix}{search_index}"></script>
+        {script}
     </body>
     </html>
     """
+
+def render_deck(indexed_perks, title="Overwatch 2 Perks", nav="", asset_prefix=''):
+    """Body markup of a flashcard page: controls, filters, search and cards"""
+    return f"""
+        <h1>{title}</h1>
+        {nav}
+        
+        <div class="controls">
+            <button id="flip-all">Flip All Cards</button>
+            <button id="reset">Reset Cards</button>
+            <button id="shuffle">Shuffle Cards</button>
+        </div>
+        
+        <div class="filters">
+            <select id="role-filter">
+                <option value="all">All Roles</option>
+                <option value="Tanks">Tanks</option>
+                <option value="Damage">Damage</option>
+                <option value="Support">Support</option>
+            </select>
+            
+            <select id="hero-filter">
+                <option value="all">All Heroes</option>
+            </select>
+            
+            <select id="tier-filter">
+                <option value="all">All Tiers</option>
+                <option value="Major Perk">Major Perks</option>
+                <option value="Minor Perk">Minor Perks</option>
+            </select>
+        </div>
+        
+        <div class="search">
+            <input type="search" id="search" placeholder="Search perks, e.g. cooldown" autocomplete="off">
+        </div>
+        
+        <div class="stats" id="stats"></div>
+        
+        <div class="flashcard-container" id="flashcards">
+{render_cards(indexed_perks, asset_prefix)}
+        </div>
+    """
+
+# Directory for the split (per-role / per-hero) deck
+DECK_DIR = 'deck'
+
+def write_split_deck(perks, locale=DEFAULT_LOCALE, compositor=False):
+    """Write per-role and per-hero pages plus a linking index page into DECK_DIR.
+
+    The pages share perks.css and perks.js instead of inlining them, and keep
+    each card's global data-index so the shared search index still applies.
+    Other locales get their own directory (deck.fr, ...).
+    """
+    deck_dir = locale_filename(DECK_DIR, locale)
+    os.makedirs(deck_dir, exist_ok=True)
+    with open(os.path.join(deck_dir, 'perks.css'), 'w', encoding='utf-8') as f:
+        f.write(page_css('../'))
+    with open(os.path.join(deck_dir, 'perks.js'), 'w', encoding='utf-8') as f:
+        f.write(page_js())
+    
+    # Group (search index row, Perk) pairs by role and by hero, keeping dataset order
+    by_role = {}
+    by_hero = {}
+    for i, perk in enumerate(perks):
+        by_role.setdefault(perk.role, []).append((i, perk))
+        by_hero.setdefault(perk.hero, []).append((i, perk))
+    
+    nav_links = '<a href="index.html" data-prefetch>All Heroes</a>' + "".join(
+        f'<a href="{role.lower()}.html" data-prefetch>{role}</a>' for role in by_role
+    )
+    nav = f'<nav class="deck-nav">{nav_links}</nav>'
+    
+    def write_page(filename, title, indexed_perks):
+        html_output = render_page(
+            render_deck(indexed_perks, title, nav, '../'), title, '../', inline_assets=False,
+            locale=locale, compositor=compositor
+        )
+        with open(os.path.join(deck_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html_output)
+    
+    for role, indexed_perks in by_role.items():
+        write_page(f"{role.lower()}.html", f"{role} Perks", indexed_perks)
+    for hero, indexed_perks in by_hero.items():
+        write_page(f"{hero_slug(hero)}.html", f"{hero} Perks", indexed_perks)
     
-    with open('index.html', 'w', encoding='utf-8') as f:
+    # Index page linking every role and hero page
+    sections = ""
+    for role, indexed_perks in by_role.items():
+        # First card of each hero, for its icon
+        heroes = {}
+        for _, perk in indexed_perks:
+            heroes.setdefault(perk.hero, perk)
+        hero_links = "".join(
+            f"""
+                <a class="deck-hero" href="{hero_slug(hero)}.html" data-prefetch>
+                    <img src="{hero_icon_src(perk, '../')}" alt="{hero}">
+                    <span>{hero}</span>
+                </a>"""
+            for hero, perk in heroes.items()
+        )
+        sections += f"""
+        <section class="deck-role">
+            <h2><a href="{role.lower()}.html" data-prefetch>{role}</a></h2>
+            <div class="deck-heroes">{hero_links}
+            </div>
+        </section>"""
+    
+    index_body = f"""
+        <h1>Overwatch 2 Perks</h1>
+        {nav}
+        {sections}
+    """
+    with open(os.path.join(deck_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_page(index_body, "Overwatch 2 Perks", '../', inline_assets=False, locale=locale))
+    print(f"Split deck saved to {deck_dir}/ ({len(by_role)} role and {len(by_hero)} hero pages)")
+
+def render_outputs(perks, split=False, locale=DEFAULT_LOCALE, compositor=False):
+    """Write the search index, index.html and service worker from Perk records.
+
+    With split, also write the per-role/per-hero deck (see write_split_deck).
+    Outputs for locales other than the default get a locale suffix.
+    compositor renders the pages in compositor mode (see render_page).
+    """
+    # Save the full-text search index as a script so it also loads over file://
+    search_index = build_search_index(perks)
+    search_index_file = locale_filename('perk_search_index.js', locale)
+    with open(search_index_file, 'w', encoding='utf-8') as f:
+        f.write("window.PERK_SEARCH_INDEX = ")
+        json.dump(search_index, f, ensure_ascii=False, separators=(',', ':'))
+        f.write(";\n")
+    print(f"Search index saved to {search_index_file}")
+    
+    # Save to HTML with flashcard functionality
+    html_file = locale_filename('index.html', locale)
+    html_output = render_page(render_deck(list(enumerate(perks))), locale=locale, compositor=compositor)
+    with open(html_file, 'w', encoding='utf-8') as f:
         f.write(html_output)
-    print("Data saved to index.html")
+    print(f"Data saved to {html_file}")
+    
+    if split:
+        write_split_deck(perks, locale, compositor)
+    
+    write_service_worker()
+
+# Files the service worker precaches, relative to index.html
+PRECACHE_PATTERNS = [
+    'index*.html',
+    'perk_search_index*.js',
+    'overwatch_perks*.csv',
+    'overwatch_perks*.xlsx',
+    '*.ttf',
+    'perk_icons/*.png',
+    'hero_icons/*.png',
+    DECK_DIR + '*/*',
+]
+
+def build_precache_manifest():
+    """List every precached file with a hash of its contents"""
+    entries = []
+    for pattern in PRECACHE_PATTERNS:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'rb') as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+            entries.append({'url': path.replace(os.sep, '/'), 'hash': content_hash})
+    
+    # The version changes whenever any entry is added, removed or modified
+    version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return {'version': version, 'entries': entries}
+
+def write_service_worker():
+    """Write precache-manifest.json and a cache-first service worker (sw.js)"""
+    manifest = build_precache_manifest()
+    with open('precache-manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    print(f"Precache manifest saved to precache-manifest.json ({len(manifest['entries'])} files)")
+    
+    # The manifest version is baked into sw.js, so every rebuild that changes a
+    # file also changes sw.js and makes the browser install the new worker
+    sw_output = """
+    const MANIFEST_VERSION = '__MANIFEST_VERSION__';
+    const CACHE_PREFIX = 'ow2-perks-precache-';
+    const CACHE_NAME = CACHE_PREFIX + MANIFEST_VERSION;
+    const RUNTIME_CACHE = 'ow2-perks-runtime';
+    const MANIFEST_URL = 'precache-manifest.json';
+    
+    // Third-party hosts cached on first use (Google Fonts, fallback icons)
+    const RUNTIME_HOSTS = ['fonts.googleapis.com', 'fonts.gstatic.com', 'static.wikia.nocookie.net'];
+    
+    function absolute(url) {
+        return new URL(url, self.registration.scope).href;
+    }
+    
+    self.addEventListener('install', event => {
+        event.waitUntil((async () => {
+            const response = await fetch(MANIFEST_URL, { cache: 'no-store' });
+            const manifest = await response.json();
+            const cache = await caches.open(CACHE_NAME);
+            
+            // Find entries already cached by a previous version with the same hash
+            const previous = new Map();
+            for (const name of await caches.keys()) {
+                if (!name.startsWith(CACHE_PREFIX) || name === CACHE_NAME) continue;
+                const oldCache = await caches.open(name);
+                const oldManifest = await oldCache.match(absolute(MANIFEST_URL));
+                if (!oldManifest) continue;
+                for (const entry of (await oldManifest.json()).entries) {
+                    previous.set(entry.url + '#' + entry.hash, oldCache);
+                }
+            }
+            
+            // Copy unchanged entries locally and download only the changed ones
+            const changed = [];
+            await Promise.all(manifest.entries.map(async entry => {
+                const oldCache = previous.get(entry.url + '#' + entry.hash);
+                const cached = oldCache && await oldCache.match(absolute(entry.url));
+                if (cached) {
+                    await cache.put(absolute(entry.url), cached);
+                } else {
+                    changed.push(new Request(absolute(entry.url), { cache: 'reload' }));
+                }
+            }));
+            await cache.addAll(changed);
+            
+            // Stored last, so an interrupted install never looks complete
+            await cache.put(absolute(MANIFEST_URL), new Response(JSON.stringify(manifest)));
+            await self.skipWaiting();
+        })());
+    });
+    
+    self.addEventListener('activate', event => {
+        event.waitUntil((async () => {
+            for (const name of await caches.keys()) {
+                if (name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME) {
+                    await caches.delete(name);
+                }
+            }
+            await self.clients.claim();
+        })());
+    });
+    
+    self.addEventListener('fetch', event => {
+        const request = event.request;
+        if (request.method !== 'GET') return;
+        const url = new URL(request.url);
+        
+        if (url.origin === self.location.origin) {
+            // Cache first for everything in the manifest
+            let key = url.origin + url.pathname;
+            if (request.mode === 'navigate' && key.endsWith('/')) key += 'index.html';
+            event.respondWith((async () => {
+                const cache = await caches.open(CACHE_NAME);
+                return (await cache.match(key)) || fetch(request);
+            })());
+        } else if (RUNTIME_HOSTS.includes(url.hostname)) {
+            // Cache first, filled on first use
+            event.respondWith((async () => {
+                const cache = await caches.open(RUNTIME_CACHE);
+                const cached = await cache.match(request);
+                if (cached) return cached;
+                const response = await fetch(request);
+                if (response.ok || response.type === 'opaque') {
+                    await cache.put(request, response.clone());
+                }
+                return response;
+            })());
+        }
+    });
+    """.replace('__MANIFEST_VERSION__', manifest['version'])
+    
+    with open('sw.js', 'w', encoding='utf-8') as f:
+        f.write(sw_output)
+    print("Service worker saved to sw.js")
 
 if __name__ == "__main__":
-    print("Scraping Overwatch perks data...")
-    perks_data = scrape_overwatch_perks()
+    import argparse
     
-    if perks_data is not None and not perks_data.empty:
-        print(f"Successfully scraped {len(perks_data)} perks!")
+    parser = argparse.ArgumentParser(description="Scrape and render Overwatch 2 perks")
+    subparsers = parser.add_subparsers(dest='command')
+    scrape_parser = subparsers.add_parser('scrape', help="scrape the wiki, download icons and write every output (default)")
+    render_parser = subparsers.add_parser('render', help="rebuild the page from the existing CSV (no pandas)")
+    render_parser.add_argument('--data', help="perks CSV to render (default: the locale's CSV)")
+    for subparser in (scrape_parser, render_parser):
+        subparser.add_argument('--split', action='store_true',
+                               help=f"also write per-role and per-hero pages to {DECK_DIR}/")
+        subparser.add_argument('--compositor', action='store_true',
+                               help="render cards so flips and hovers run on the compositor")
+    scrape_parser.add_argument('--locale', action='append', choices=sorted(LOCALES),
+                               help=f"locale to scrape; repeat for several (default: {DEFAULT_LOCALE})")
+    render_parser.add_argument('--locale', choices=sorted(LOCALES), default=DEFAULT_LOCALE)
+    verify_parser = subparsers.add_parser('verify', help="check the icon cache and re-fetch broken icons")
+    verify_parser.add_argument('--data', default=DATA_FILE, help="perks CSV with the icon URLs")
+    verify_parser.add_argument('--full', action='store_true', help="fully check every icon, ignoring the manifest")
+    query_parser = subparsers.add_parser('query', help="print matching perks from the existing CSV as JSON")
+    query_parser.add_argument('--data', default=DATA_FILE)
+    for param in INDEXED_FIELDS:
+        query_parser.add_argument(f'--{param}', action='append', help="repeat to match any of several values")
+    args = parser.parse_args()
+    
+    if args.command == 'render':
+        data_file = args.data or locale_filename(DATA_FILE, args.locale)
+        perks = load_perks_csv(data_file)
+        # Offline check only; re-fetching is left to scrape and verify
+        verify_icon_cache(perks, fix=False)
+        render_outputs(perks, args.split, args.locale, args.compositor)
+    elif args.command == 'verify':
+        perks = load_perks_csv(args.data) if os.path.exists(args.data) else []
+        verify_icon_cache(perks, args.full)
+    elif args.command == 'query':
+        perks = load_perks_csv(args.data)
+        params = {param: getattr(args, param) for param in INDEXED_FIELDS if getattr(args, param)}
+        matches = query_indexes(perks, build_indexes(perks), params)
+        print(json.dumps([perk._asdict() for perk in matches], ensure_ascii=False, indent=2))
+    else:
+        split = getattr(args, 'split', False)
+        compositor = getattr(args, 'compositor', False)
+        locales = list(dict.fromkeys(getattr(args, 'locale', None) or [DEFAULT_LOCALE]))
+        # The default locale goes first so shared icons keep their existing file names
+        locales.sort(key=lambda locale: locale != DEFAULT_LOCALE)
         
-        # Download images
-        print("Downloading perk icons...")
-        perks_data = download_images(perks_data)
+        print(f"Scraping Overwatch perks data ({', '.join(locales)})...")
+        scraped = scrape_locales(locales)
         
-        save_to_formats(perks_data)
-    else:
-        print("Failed to scrape perks data.")
\ No newline at end of file
+        # Shared between locales so each icon is downloaded once
+        downloaded_icons = {}
+        
+        for locale, perks_data in scraped.items():
+            if perks_data is not None and not perks_data.empty:
+                print(f"Successfully scraped {len(perks_data)} perks for {locale}!")
+                
+                # Download images
+                print("Downloading perk icons...")
+                perks_data = download_images(perks_data, downloaded_icons)
+                verify_icon_cache(perks_from_dataframe(perks_data))
+                
+                save_to_formats(perks_data, split, locale, compositor)
+            else:
+                print(f"Failed to scrape perks data for {locale}.")
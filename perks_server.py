@@ -0,0 +1,241 @@
+"""Read-only JSON query API over the scraped Overwatch perks dataset.
+
+Loads overwatch_perks.csv once into in-memory indexes (by role, hero, tier and
+perk name) and serves filtered JSON over HTTP, with ETag and gzip support. The
+data file is watched in the background and reloaded when it changes.
+
+Example queries:
+    /perks?hero=Ana
+    /perks?role=Support&tier=Major
+    /perks?hero=Mercy&hero=Moira&name=Flash Heal
+    /heroes
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from perks import DATA_FILE, INDEXED_FIELDS, build_indexes, load_perks_csv, query_indexes
+
+# Only compress bodies big enough for gzip to be worth the CPU
+GZIP_MIN_SIZE = 1024
+
+# Cap on cached responses per snapshot, so odd queries can't grow memory forever
+MAX_CACHED_RESPONSES = 4096
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip (honouring q=0 and *)"""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+class PerkSnapshot:
+    """An immutable, fully indexed view of one version of the data file.
+
+    Rendered responses are cached per snapshot, so a reload invalidates them
+    simply by swapping in a new snapshot.
+    """
+
+    def __init__(self, perks, signature=None):
+        self.perks = perks
+        self.signature = signature
+        self.indexes = build_indexes(perks)
+        self._responses = {}
+
+    def query(self, params):
+        """Return the perks matching params (see perks.query_indexes)"""
+        return query_indexes(self.perks, self.indexes, params)
+
+    def heroes_by_role(self):
+        """Return {role: [hero, ...]} in dataset order"""
+        roles = {}
+        for perk in self.perks:
+            heroes = roles.setdefault(perk.role, [])
+            if perk.hero not in heroes:
+                heroes.append(perk.hero)
+        return roles
+
+    def response(self, path, params):
+        """Return the cached [body, etag, gzipped body] entry, or None for an unknown path"""
+        cache_key = (path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        cached = self._responses.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if path == '/perks':
+            payload = [perk._asdict() for perk in self.query(params)]
+        elif path == '/heroes':
+            payload = self.heroes_by_role()
+        else:
+            return None
+
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        cached = [body, etag, None]  # gzipped body is filled in on first use
+
+        if len(self._responses) >= MAX_CACHED_RESPONSES:
+            self._responses.clear()
+        self._responses[cache_key] = cached
+        return cached
+
+
+class PerkStore:
+    """Holds the current snapshot and reloads it when the data file changes"""
+
+    def __init__(self, csv_path=DATA_FILE):
+        self.csv_path = csv_path
+        self.snapshot = PerkSnapshot(load_perks_csv(csv_path), self._signature())
+
+    def _signature(self):
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def reload_if_changed(self):
+        """Reload the data file if its mtime or size changed; return True if reloaded"""
+        signature = self._signature()
+        if signature is None or signature == self.snapshot.signature:
+            return False
+        try:
+            perks = load_perks_csv(self.csv_path)
+        except Exception as e:
+            # A half-written file will be picked up again on the next poll
+            print(f"Error reloading {self.csv_path}: {e}")
+            return False
+        # Swapping a single attribute is atomic, so readers never see a partial index
+        self.snapshot = PerkSnapshot(perks, signature)
+        print(f"Reloaded {len(perks)} perks from {self.csv_path}")
+        return True
+
+    def watch(self, interval=2.0):
+        """Start a daemon thread polling the data file for changes"""
+        def poll():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+
+        thread = threading.Thread(target=poll, name='perk-reloader', daemon=True)
+        thread.start()
+        return thread
+
+
+class PerkRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle's algorithm
+    # and delayed ACKs stall every keep-alive response by ~40ms
+    disable_nagle_algorithm = True
+    server_version = 'OW2Perks/1.0'
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+
+        unknown = [param for param in params if param not in INDEXED_FIELDS]
+        if unknown:
+            self._send_error(400, f"Unknown query parameter(s): {', '.join(sorted(unknown))}", send_body)
+            return
+
+        path = url.path.rstrip('/') or '/'
+        cached = self.server.store.snapshot.response(path, params)
+        if cached is None:
+            self._send_error(404, f"Unknown endpoint: {path}", send_body)
+            return
+        body, etag, _ = cached
+
+        if etag in self.headers.get('If-None-Match', '').replace(' ', '').split(','):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        encoding = None
+        if len(body) >= GZIP_MIN_SIZE and accepts_gzip(self.headers.get('Accept-Encoding', '')):
+            if cached[2] is None:
+                cached[2] = gzip.compress(body, compresslevel=6)
+            body = cached[2]
+            encoding = 'gzip'
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Cache-Control', 'no-cache')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message, send_body=True):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        # A HEAD response must not carry a body, or it corrupts the next keep-alive response
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging to stderr costs more than serving a cached response
+        pass
+
+
+def make_server(host='127.0.0.1', port=8000, csv_path=DATA_FILE, reload_interval=2.0):
+    """Create (but don't start) a server over csv_path"""
+    server = ThreadingHTTPServer((host, port), PerkRequestHandler)
+    server.daemon_threads = True
+    server.store = PerkStore(csv_path)
+    if reload_interval:
+        server.store.watch(reload_interval)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Overwatch perks dataset as JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=DATA_FILE, help="perks CSV to serve")
+    parser.add_argument('--reload-interval', type=float, default=2.0,
+                        help="seconds between data file checks (0 disables reloading)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.data, args.reload_interval)
+    print(f"Serving {len(server.store.snapshot.perks)} perks on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down")
+    finally:
+        server.server_close()